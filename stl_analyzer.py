@@ -13,18 +13,27 @@ Features:
 Dependencies:
 - tkinter (built-in)
 - numpy-stl
+- stl-reader (optional, speeds up ASCII files)
+- numba (optional, speeds up very large meshes)
 - threading (built-in)
+- concurrent.futures (built-in)
 """
 
 import os
 import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from pathlib import Path
 import csv
+import json
+import mmap
+from operator import attrgetter
 from datetime import datetime
 import threading
+import time
 import queue
+from collections import deque, namedtuple
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
 import webbrowser
 
 # Handle numpy-stl import
@@ -35,6 +44,444 @@ try:
 except ImportError:
     STL_AVAILABLE = False
 
+# Optional compiled STL parser, much faster than numpy-stl on ASCII files
+try:
+    import stl_reader
+    STL_READER_AVAILABLE = True
+except ImportError:
+    STL_READER_AVAILABLE = False
+
+# Optional JIT compiler for the bounding box and volume. The kernel works on
+# numpy arrays, so it is only used when the numpy-stl import succeeded
+try:
+    import numba
+    NUMBA_AVAILABLE = STL_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Binary STL layout: 80-byte header, uint32 triangle count, then one
+# 50-byte record per triangle (normal, 3 vertices, attribute byte count)
+STL_HEADER_SIZE = 84
+STL_RECORD_SIZE = 50
+
+# File extensions picked up by folder scans, lowercase
+STL_EXTENSIONS = frozenset({'.stl'})
+
+# CSV export columns, in output order
+CSV_FIELDNAMES = ('folder', 'file', 'width_x', 'depth_y', 'height_z',
+                  'volume', 'triangle_count', 'unit', 'status')
+CSV_BUFFER_SIZE = 1 << 20
+
+# Result of analyzing one file. A tuple in CSV column order, so it pickles
+# compactly from the workers and is written to the CSV as is
+Result = namedtuple('Result', CSV_FIELDNAMES)
+
+# Rows written between flushes of the streamed CSV, so an interrupted run
+# still leaves the results so far on disk
+CSV_FLUSH_ROWS = 100
+
+# Measurements of unchanged files are reused from this file in the scanned folder
+CACHE_FILENAME = ".stl_dims_cache.json"
+# Bump when cached results change meaning, so older caches are discarded
+CACHE_VERSION = 1
+CACHED_FIELDS = ('width_x', 'depth_y', 'height_z', 'volume', 'triangle_count')
+
+# Results are added to the table in batches of this size
+TREE_BATCH_SIZE = 32
+
+# Most worker messages handled per GUI tick, so a burst can't freeze the window
+QUEUE_DRAIN_LIMIT = 500
+
+# Interval of the fallback check for messages whose wakeup event was missed
+QUEUE_HEARTBEAT_MS = 500
+
+# Result fields in results table column order
+TREE_FIELDS = attrgetter('folder', 'file', 'width_x', 'depth_y', 'height_z',
+                         'volume', 'triangle_count', 'status')
+
+# Minimum interval in seconds between progress updates sent to the GUI
+PROGRESS_INTERVAL = 0.2
+
+# Most worker processes a pool can wait on under Windows
+WINDOWS_MAX_WORKERS = 61
+
+# Files averaging less than this many bytes are sent to the workers in
+# batches, aiming for this many batches per worker
+BATCH_MAX_AVERAGE_SIZE = 1 << 20
+BATCHES_PER_WORKER = 32
+
+# Files queued for prefetching ahead of the ones the workers are reading,
+# and how much of each is read where posix_fadvise isn't available
+PREFETCH_AHEAD = 4
+PREFETCH_READ_SIZE = 64 * 1024
+
+if STL_AVAILABLE:
+    # Normals and attribute bytes are never read, so they stay opaque padding
+    STL_RECORD_DTYPE = np.dtype([('normal', 'V12'),
+                                 ('vectors', '<f4', (3, 3)),
+                                 ('attr', 'V2')])
+
+def read_stl_header(file_path):
+    """
+    Read the triangle count from a binary STL header
+    
+    Args:
+        file_path (str): Path to the STL file
+    
+    Returns:
+        tuple: (triangle_count, file_size), or None if the file looks like
+        an ASCII STL
+    """
+    with open(file_path, 'rb') as f:
+        header = f.read(STL_HEADER_SIZE)
+        file_size = os.fstat(f.fileno()).st_size
+    
+    if len(header) < STL_HEADER_SIZE:
+        return None
+    
+    # A binary file's size is fixed by its triangle count. Some exporters
+    # start binary headers with "solid" too, so that alone is not enough.
+    # Like numpy-stl, "solid" may be in any case and follow whitespace
+    triangle_count = int.from_bytes(header[80:84], 'little')
+    expected_size = STL_HEADER_SIZE + triangle_count * STL_RECORD_SIZE
+    if file_size != expected_size and header.lstrip().lower().startswith(b'solid'):
+        return None
+    
+    return triangle_count, file_size
+
+def stl_triangle_count(file_path):
+    """
+    Get the triangle count of a binary STL file from its 84-byte header,
+    without reading any triangle data
+    
+    Args:
+        file_path (str): Path to the STL file
+    
+    Returns:
+        int: Number of triangles, or None for ASCII files, which have to be
+        parsed to count them
+    """
+    header = read_stl_header(file_path)
+    if header is None:
+        return None
+    
+    triangle_count, file_size = header
+    if file_size < STL_HEADER_SIZE + triangle_count * STL_RECORD_SIZE:
+        raise ValueError(f"Truncated binary STL: expected {triangle_count} triangles")
+    return triangle_count
+
+def read_binary_stl(file_path):
+    """
+    Map the triangle vertices of a binary STL file without parsing it
+    
+    Args:
+        file_path (str): Path to the STL file
+    
+    Returns:
+        numpy.ndarray: (N, 3, 3) float32 view of the triangle vertices,
+        or None if the file looks like an ASCII STL
+    """
+    triangle_count = stl_triangle_count(file_path)
+    if triangle_count is None:
+        return None
+    
+    if triangle_count == 0:
+        return np.empty((0, 3, 3), dtype=np.float32)
+    
+    # Every record is read once, front to back: ask for aggressive read-ahead.
+    # posix_fadvise and madvise are not available on Windows
+    with open(file_path, 'rb') as f:
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                # A hint only: some filesystems and pipes reject it
+                pass
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    if hasattr(mapping, 'madvise'):
+        try:
+            mapping.madvise(mmap.MADV_SEQUENTIAL)
+            mapping.madvise(mmap.MADV_WILLNEED)
+        except (AttributeError, OSError):
+            pass
+    
+    # The mapping stays open for as long as the returned view is referenced
+    records = np.frombuffer(mapping, dtype=STL_RECORD_DTYPE, count=triangle_count,
+                            offset=STL_HEADER_SIZE)
+    return records['vectors']
+
+def _mesh_extents(vectors, compute_volume):
+    """Bounding box extents and signed volume of (N, 3, 3) vertices in a single pass"""
+    min_x = min_y = min_z = np.inf
+    max_x = max_y = max_z = -np.inf
+    volume = 0.0
+    for i in range(vectors.shape[0]):
+        for j in range(3):
+            min_x = min(min_x, vectors[i, j, 0])
+            min_y = min(min_y, vectors[i, j, 1])
+            min_z = min(min_z, vectors[i, j, 2])
+            max_x = max(max_x, vectors[i, j, 0])
+            max_y = max(max_y, vectors[i, j, 1])
+            max_z = max(max_z, vectors[i, j, 2])
+        if compute_volume:
+            # Scalar triple product v0 . (v1 x v2), accumulated in float64
+            ax, ay, az = np.float64(vectors[i, 0, 0]), np.float64(vectors[i, 0, 1]), np.float64(vectors[i, 0, 2])
+            bx, by, bz = np.float64(vectors[i, 1, 0]), np.float64(vectors[i, 1, 1]), np.float64(vectors[i, 1, 2])
+            cx, cy, cz = np.float64(vectors[i, 2, 0]), np.float64(vectors[i, 2, 1]), np.float64(vectors[i, 2, 2])
+            volume += ax * (by * cz - bz * cy) + ay * (bz * cx - bx * cz) + az * (bx * cy - by * cx)
+    return np.array([max_x - min_x, max_y - min_y, max_z - min_z]), volume / 6.0
+
+if NUMBA_AVAILABLE:
+    # Serial only: files are already spread over one worker process per CPU,
+    # so threading inside each would oversubscribe the cores. Frozen
+    # executables have no source file for numba to key its on-disk cache on.
+    # fastmath is left off: it assumes no infinities, which the min/max start from
+    _JIT_CACHE = not getattr(sys, 'frozen', False)
+    mesh_extents = numba.njit(boundscheck=False, cache=_JIT_CACHE)(_mesh_extents)
+
+def prime_jit():
+    """Compile the JIT kernel before a worker process gets its first file"""
+    if NUMBA_AVAILABLE:
+        # Read-only strided records, the layout of a mapped binary STL
+        records = np.zeros(2, dtype=STL_RECORD_DTYPE)
+        records.flags.writeable = False
+        mesh_extents(records['vectors'], True)
+
+def get_stl_dimensions(stl_file_path, file_name, base_folder=None, compute_volume=False):
+    """
+    Analyze a single STL file
+    
+    Args:
+        stl_file_path (str): Path to the STL file
+        file_name (str): File name shown in the results
+        base_folder (str): Folder that relative folder names are based on
+        compute_volume (bool): Whether to compute the mesh volume, which
+            costs extra work for every triangle
+        
+    Returns:
+        Result: Dimensions, volume and triangle count of the mesh; volume is
+        left empty when not computed
+    """
+    try:
+        # Binary files are reduced straight from the mapped file,
+        # a parser is only needed for ASCII ones
+        vectors = read_binary_stl(stl_file_path)
+        if vectors is None and STL_READER_AVAILABLE:
+            try:
+                vertices, indices = stl_reader.read(stl_file_path)
+                vectors = vertices[indices]
+            except RuntimeError:
+                # stl_reader rejects some files numpy-stl accepts, such as an
+                # upper case "SOLID" or whitespace before it
+                pass
+        if vectors is None:
+            vectors = mesh.Mesh.from_file(stl_file_path).vectors
+        
+        if len(vectors) == 0:
+            raise ValueError("STL file contains no triangles")
+        
+        signed_volume = None
+        if NUMBA_AVAILABLE:
+            # One compiled sweep keeping six running min/max values and,
+            # if asked for, the volume sum
+            dimensions, signed_volume = mesh_extents(vectors, compute_volume)
+        else:
+            # Reduce across triangles first: that is an element-wise pass over
+            # whole records, about 3x faster than reducing both axes at once
+            dimensions = (vectors.max(axis=0).max(axis=0)
+                          - vectors.min(axis=0).min(axis=0))
+        
+        # Round all three axes at once, in float64 so float32 noise doesn't
+        # leak into the output (e.g. 25.399999618530273)
+        width_x, depth_y, height_z = np.round(dimensions.astype(np.float64), 3).tolist()
+        
+        volume = ''
+        if compute_volume:
+            try:
+                if signed_volume is None:
+                    # Divergence theorem: sum of signed tetrahedra volumes. The same
+                    # for every loader; numpy-stl's get_mass_properties would also
+                    # work out the centroid and inertia, which are never shown.
+                    # In float64 throughout, like the JIT kernel, so the volume
+                    # doesn't depend on whether numba is installed
+                    vertices = vectors.astype(np.float64)
+                    signed_volume = np.einsum('ij,ij->', vertices[:, 0],
+                                              np.cross(vertices[:, 1], vertices[:, 2])) / 6.0
+                # Converted to a plain float once, so rounding and the CSV/cache
+                # writers don't go through NumPy scalar methods
+                volume = round(float(signed_volume), 3)
+            except:
+                volume = 0
+        
+        return Result(
+            folder=get_relative_folder(stl_file_path, base_folder),
+            file=file_name,
+            width_x=width_x,
+            depth_y=depth_y,
+            height_z=height_z,
+            volume=volume,
+            triangle_count=len(vectors),
+            unit='mm',
+            status='OK'
+        )
+        
+    except Exception as e:
+        return Result(
+            folder=get_relative_folder(stl_file_path, base_folder),
+            file=file_name,
+            width_x=0,
+            depth_y=0,
+            height_z=0,
+            volume=0,
+            triangle_count=0,
+            unit='mm',
+            status=f'Error: {str(e)}'
+        )
+
+if not STL_AVAILABLE:
+    # Chosen once at import instead of checking the flag for every file
+    def get_stl_dimensions(stl_file_path, file_name, base_folder=None, compute_volume=False):
+        """Report that numpy-stl is missing without touching the file"""
+        return Result(
+            folder=get_relative_folder(stl_file_path, base_folder),
+            file=file_name,
+            width_x=0,
+            depth_y=0,
+            height_z=0,
+            volume=0,
+            triangle_count=0,
+            unit='mm',
+            status='Error: numpy-stl not installed'
+        )
+
+def analyze_batch(files, base_folder=None, compute_volume=False):
+    """
+    Analyze several STL files in one worker call
+    
+    Args:
+        files (list): (path, file name) pairs of the files to analyze
+        base_folder (str): Folder that relative folder names are based on
+        compute_volume (bool): Whether to compute the mesh volumes
+        
+    Returns:
+        list: Result of get_stl_dimensions for each file, in order
+    """
+    return [get_stl_dimensions(path, name, base_folder, compute_volume)
+            for path, name in files]
+
+def get_relative_folder(file_path, base_folder):
+    """Get relative folder path for display"""
+    if base_folder:
+        # Paths found by scanning base_folder start with it verbatim, so the
+        # common case is plain string slicing
+        prefix = os.path.join(base_folder, '')
+        if file_path.startswith(prefix):
+            return os.path.dirname(file_path[len(prefix):]) or "."
+        try:
+            parent_folder = os.path.dirname(file_path)
+            if parent_folder == base_folder:
+                return "."  # Root folder
+            else:
+                return os.path.relpath(parent_folder, base_folder)
+        except:
+            return os.path.dirname(file_path)
+    return os.path.dirname(file_path)
+
+def prefetch_file(file_path):
+    """Ask the OS to start reading a file into the page cache"""
+    try:
+        with open(file_path, 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                # Returns immediately, the kernel reads ahead in the background
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                f.read(PREFETCH_READ_SIZE)
+    except OSError:
+        pass
+
+def prefetch_worker(path_queue):
+    """Prefetch queued file paths until None is received"""
+    while True:
+        file_path = path_queue.get()
+        if file_path is None:
+            return
+        prefetch_file(file_path)
+
+def load_cache(folder):
+    """Load cached measurements for a folder, or an empty cache"""
+    try:
+        with open(os.path.join(folder, CACHE_FILENAME), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+            return {}
+        files = cache.get('files')
+        return files if isinstance(files, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(folder, cache):
+    """Write cached measurements back; the cache is optional, so errors are ignored"""
+    try:
+        with open(os.path.join(folder, CACHE_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': cache}, f)
+    except OSError:
+        pass
+
+def prune_cache(cache):
+    """Drop entries for files that no longer exist; returns whether any were dropped"""
+    missing = [path for path in cache if not os.path.exists(path)]
+    for path in missing:
+        del cache[path]
+    return bool(missing)
+
+def get_cached_dimensions(cache, stl_file_path, file_name, file_stat, base_folder, compute_volume):
+    """
+    Build a result from the cache if the file is unchanged since it was measured
+    
+    Args:
+        cache (dict): Cache entries keyed by absolute file path
+        stl_file_path (str): Path to the STL file
+        file_name (str): File name shown in the results
+        file_stat (os.stat_result): Current stat of the file
+        base_folder (str): Folder that relative folder names are based on
+        compute_volume (bool): Whether the volume is needed
+        
+    Returns:
+        Result: Same as get_stl_dimensions, or None on a cache miss
+    """
+    try:
+        entry = cache.get(os.path.abspath(stl_file_path))
+        if (not entry or entry.get('size') != file_stat.st_size
+                or entry.get('mtime_ns') != file_stat.st_mtime_ns):
+            return None
+        
+        measurements = entry['result']
+        if compute_volume and measurements['volume'] == '':
+            return None
+        
+        return Result(
+            folder=get_relative_folder(stl_file_path, base_folder),
+            file=file_name,
+            width_x=measurements['width_x'],
+            depth_y=measurements['depth_y'],
+            height_z=measurements['height_z'],
+            volume=measurements['volume'] if compute_volume else '',
+            triangle_count=measurements['triangle_count'],
+            unit='mm',
+            status='OK'
+        )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        # A malformed entry is treated as a miss; the file is parsed again
+        return None
+
+def write_results_csv(csv_path, results):
+    """Write analysis results to a CSV file in one buffered batch"""
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_FIELDNAMES)
+        writer.writerows(results)
+
 class STLAnalyzerGUI:
     def __init__(self, root):
         self.root = root
@@ -45,16 +492,24 @@ class STLAnalyzerGUI:
         # Variables
         self.selected_folder = tk.StringVar()
         self.recursive_search = tk.BooleanVar(value=False)  # Toggle for recursive search
+        self.compute_volume = tk.BooleanVar(value=False)  # Toggle for volume calculation
         self.processing = False
         self.stop_requested = False  # Flag for stopping analysis
         self.results = []
-        self.output_queue = queue.Queue()
+        self.success_count = 0  # Successful results received by the GUI
+        self.stl_files = None  # Files found by the last scan, not yet analyzed
+        self.stl_files_scope = None  # (folder, recursive) that scan covered
+        self.last_export_path = None
+        self.output_queue = deque()  # Messages from the analysis thread
         
         # Setup GUI
         self.setup_styles()
         self.create_widgets()
         self.center_window()
         
+        # The background thread raises this when it queues a message
+        self.root.bind('<<QueueUpdate>>', lambda event: self.drain_queue())
+        
         # Check dependencies
         if not STL_AVAILABLE:
             self.show_dependency_warning()
@@ -112,9 +567,17 @@ class STLAnalyzerGUI:
         )
         self.recursive_checkbox.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
         
+        # Volume calculation option
+        self.volume_checkbox = ttk.Checkbutton(
+            folder_frame, 
+            text="Compute volume (slower)", 
+            variable=self.compute_volume
+        )
+        self.volume_checkbox.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
         # File count display
         self.file_count_label = ttk.Label(folder_frame, text="No folder selected")
-        self.file_count_label.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        self.file_count_label.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
         
         # Control buttons
         button_frame = ttk.Frame(main_frame)
@@ -169,6 +632,10 @@ class STLAnalyzerGUI:
             self.results_tree.heading(col, text=col)
             self.results_tree.column(col, width=column_widths.get(col, 100), minwidth=50)
         
+        # Row colors by status
+        self.results_tree.tag_configure('success', foreground='black')
+        self.results_tree.tag_configure('error', foreground='red')
+        
         # Scrollbars for treeview
         v_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
         h_scrollbar = ttk.Scrollbar(results_frame, orient=tk.HORIZONTAL, command=self.results_tree.xview)
@@ -216,39 +683,33 @@ class STLAnalyzerGUI:
             recursive (bool): Whether to search subfolders
             
         Returns:
-            list: List of Path objects for STL files
+            list: List of os.DirEntry objects for STL files, which carry
+            both the path and the file name
         """
         stl_files = []
-        folder = Path(folder_path)
         
-        if recursive:
-            # Recursive search using rglob
-            for ext in ['**/*.stl', '**/*.STL']:
-                stl_files.extend(folder.rglob(ext.split('/')[-1]))
-        else:
-            # Non-recursive search using glob
-            for ext in ['*.stl', '*.STL']:
-                stl_files.extend(folder.glob(ext))
-        
-        # Filter and deduplicate
-        unique_files = {}
-        for stl_file in stl_files:
-            if stl_file.name.lower().endswith('.stl') and stl_file.is_file():
-                # Use full path as key to allow same filenames in different folders
-                file_key = str(stl_file)
-                unique_files[file_key] = stl_file
-        
-        return list(unique_files.values())
-        """Open folder selection dialog"""
-        folder = filedialog.askdirectory(title="Select folder containing STL files")
-        if folder:
-            self.selected_folder.set(folder)
-            self.scan_folder()
+        # Single directory pass, matching the extension case-insensitively.
+        # Only the extension is lowercased, and it is checked before
+        # is_file(), which may need a stat on some filesystems
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name[name.rfind('.'):].lower() in STL_EXTENSIONS and entry.is_file():
+                    stl_files.append(entry)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    try:
+                        stl_files.extend(self.find_stl_files(entry.path, recursive))
+                    except PermissionError:
+                        # Skip unreadable subfolders instead of failing the scan
+                        continue
+        
+        return stl_files
     
     def browse_folder(self):
         """Open folder selection dialog"""
         folder = filedialog.askdirectory(title="Select folder containing STL files")
         if folder:
+            self.stl_files = None
             self.selected_folder.set(folder)
             self.scan_folder()
     
@@ -262,12 +723,14 @@ class STLAnalyzerGUI:
             # Find STL files based on recursive setting
             recursive = self.recursive_search.get()
             stl_files = self.find_stl_files(folder, recursive)
+            self.stl_files = stl_files
+            self.stl_files_scope = (folder, recursive)
             count = len(stl_files)
             
             if count > 0:
                 # Show folder distribution if recursive
                 if recursive:
-                    folder_count = len(set(str(f.parent) for f in stl_files))
+                    folder_count = len(set(os.path.dirname(f.path) for f in stl_files))
                     if folder_count > 1:
                         count_text = f"✅ Found {count} STL file(s) in {folder_count} folder(s)"
                     else:
@@ -286,6 +749,7 @@ class STLAnalyzerGUI:
                 self.status_var.set(f"No STL files found {search_type}")
                 
         except Exception as e:
+            self.stl_files = None
             self.file_count_label.config(text=f"❌ Error scanning folder: {e}", 
                                        style='Error.TLabel')
             self.analyze_button.config(state='disabled')
@@ -302,11 +766,14 @@ class STLAnalyzerGUI:
         self.export_button.config(state='disabled')
         self.browse_button.config(state='disabled')
         self.recursive_checkbox.config(state='disabled')
+        self.volume_checkbox.config(state='disabled')
         
         # Clear previous results
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
         self.results = []
+        self.success_count = 0
+        self.last_export_path = None
         
         # Start background thread
         thread = threading.Thread(target=self.analyze_files_thread)
@@ -329,97 +796,269 @@ class STLAnalyzerGUI:
         try:
             folder = self.selected_folder.get()
             recursive = self.recursive_search.get()
+            compute_volume = self.compute_volume.get()
             
-            # Find STL files
-            stl_files = self.find_stl_files(folder, recursive)
+            # Use the files found by the folder scan if it covered the same
+            # folder and depth. Later runs rescan to pick up added or removed files
+            stl_files = self.stl_files
+            self.stl_files = None
+            fresh_scan = stl_files is None or self.stl_files_scope != (folder, recursive)
+            if fresh_scan:
+                stl_files = self.find_stl_files(folder, recursive)
             total_files = len(stl_files)
             
+            # Scanned paths are the folder joined with their relative path
+            folder_prefix = os.path.join(folder, '')
+            
             search_type = "recursively" if recursive else "in main folder"
-            self.output_queue.put(('status', f"Analyzing {total_files} files {search_type}..."))
+            self.post_message('status', f"Analyzing {total_files} files {search_type}...")
+            
+            # Stream rows to a timestamped CSV as results arrive
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            csv_path = os.path.join(folder, f"stl_dimensions_{timestamp}.csv")
+            try:
+                csvfile = open(csv_path, 'w', newline='', encoding='utf-8',
+                               buffering=CSV_BUFFER_SIZE)
+                writer = csv.writer(csvfile)
+                writer.writerow(CSV_FIELDNAMES)
+            except OSError as e:
+                csvfile = None
+                self.post_message('export_error', str(e))
+            
+            # Reuse measurements of files that haven't changed since the last run.
+            # DirEntry.stat() is cached from the scan (on Windows from the
+            # directory listing), so files kept from Browse are stat'ed again:
+            # one edited since would otherwise match its old cache entry
+            cache = load_cache(folder)
+            cache_changed = False
+            file_stats = {}
             
-            # Process each file
+            # Parse files in worker processes, handling results as they finish
+            workers = max(1, min(os.cpu_count() or 1, total_files))
+            if sys.platform == 'win32':
+                workers = min(workers, WINDOWS_MAX_WORKERS)
+            executor = None
             processed_count = 0
-            for i, stl_file in enumerate(stl_files):
-                # Check if stop was requested
-                if self.stop_requested:
-                    self.output_queue.put(('status', f"Analysis stopped by user after {processed_count}/{total_files} files"))
-                    self.output_queue.put(('stopped', processed_count))
-                    return
+            last_update = 0.0
+            stopped = False
+            prefetch_queue = None
+            try:
+                # Workers are spawned, not forked: forking from this background
+                # thread while Tk and the prefetch thread run is unsafe
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=prime_jit,
+                                               mp_context=multiprocessing.get_context('spawn'))
+                futures = {}
+                cache_hits = set()
+                to_parse = []
+                for stl_file in stl_files:
+                    try:
+                        if fresh_scan:
+                            file_stats[stl_file.path] = stl_file.stat()
+                        else:
+                            file_stats[stl_file.path] = os.stat(stl_file.path)
+                        cached = get_cached_dimensions(cache, stl_file.path, stl_file.name,
+                                                       file_stats[stl_file.path], folder, compute_volume)
+                    except OSError:
+                        # Let the worker report the unreadable file
+                        cached = None
+                    if cached is not None:
+                        future = Future()
+                        future.set_result([cached])
+                        cache_hits.add(future)
+                        futures[future] = [stl_file]
+                    else:
+                        to_parse.append(stl_file)
+                
+                # Largest files first, so the run doesn't end with one big
+                # file parsing while the other workers sit idle
+                to_parse.sort(key=lambda entry: file_stats[entry.path].st_size
+                              if entry.path in file_stats else 0, reverse=True)
                 
-                progress = (i / total_files) * 100
-                self.output_queue.put(('progress', progress))
+                # Many small files go out in batches, so pickling and waking a
+                # worker for each one doesn't outweigh the parsing itself
+                batch_size = 1
+                total_size = sum(file_stats[entry.path].st_size for entry in to_parse
+                                 if entry.path in file_stats)
+                if total_size < BATCH_MAX_AVERAGE_SIZE * len(to_parse):
+                    batch_size = max(1, len(to_parse) // (workers * BATCHES_PER_WORKER))
                 
-                # Show relative path for better context
-                relative_path = os.path.relpath(str(stl_file), folder)
-                self.output_queue.put(('status', f"Processing ({i+1}/{total_files}): {relative_path}"))
+                # Deal the size-sorted files out round-robin, so every batch gets
+                # a mix of sizes instead of the first one taking all the big files.
+                # With single-file batches this keeps the largest-first order
+                batch_count = -(-len(to_parse) // batch_size)
+                for index in range(batch_count):
+                    batch = to_parse[index::batch_count]
+                    future = executor.submit(analyze_batch, [(entry.path, entry.name) for entry in batch],
+                                             folder, compute_volume)
+                    futures[future] = batch
                 
-                # Analyze file
-                result = self.get_stl_dimensions(str(stl_file), folder)
-                self.results.append(result)
-                self.output_queue.put(('result', result))
-                processed_count += 1
+                # The pool starts files in submission order, so page in the few
+                # queued behind the ones the workers are reading now. Each
+                # finished file moves the window one further. Batched files are
+                # too small for prefetching to pay off
+                submitted_paths = [entry.path for entry in to_parse] if batch_size == 1 else []
+                prefetch_next = workers + PREFETCH_AHEAD
+                if len(submitted_paths) > workers:
+                    prefetch_queue = queue.Queue()
+                    threading.Thread(target=prefetch_worker, args=(prefetch_queue,),
+                                     daemon=True).start()
+                    for path in submitted_paths[workers:prefetch_next]:
+                        prefetch_queue.put(path)
+                
+                # A large file no longer holds back results queued behind it
+                for future in as_completed(futures):
+                    if (prefetch_queue is not None and future not in cache_hits
+                            and prefetch_next < len(submitted_paths)):
+                        prefetch_queue.put(submitted_paths[prefetch_next])
+                        prefetch_next += 1
+                    
+                    for stl_file, result in zip(futures[future], future.result()):
+                        self.results.append(result)
+                        file_stat = file_stats.get(stl_file.path)
+                        if (result.status == 'OK' and file_stat is not None
+                                and future not in cache_hits):
+                            cache[os.path.abspath(stl_file.path)] = {
+                                'size': file_stat.st_size,
+                                'mtime_ns': file_stat.st_mtime_ns,
+                                'result': {field: getattr(result, field) for field in CACHED_FIELDS},
+                            }
+                            cache_changed = True
+                        self.post_message('result', result)
+                        processed_count += 1
+                        if csvfile is not None:
+                            writer.writerow(result)
+                            if processed_count % CSV_FLUSH_ROWS == 0:
+                                csvfile.flush()
+                        
+                        # Throttle progress updates; the last file is always reported
+                        now = time.monotonic()
+                        if now - last_update < PROGRESS_INTERVAL and processed_count < total_files:
+                            continue
+                        last_update = now
+                        
+                        progress = (processed_count / total_files) * 100
+                        self.post_message('progress', progress)
+                        
+                        # Show relative path for better context
+                        relative_path = stl_file.path[len(folder_prefix):]
+                        self.post_message('status', f"Processed ({processed_count}/{total_files}): {relative_path}")
+                    
+                    # Check if stop was requested, keeping the batch that just finished
+                    if self.stop_requested and processed_count < total_files:
+                        for pending in futures:
+                            pending.cancel()
+                        stopped = True
+                        break
+            finally:
+                if prefetch_queue is not None:
+                    prefetch_queue.put(None)
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                if csvfile is not None:
+                    csvfile.close()
+                    # Don't leave a header-only CSV behind, even if the run failed
+                    if not processed_count:
+                        try:
+                            os.remove(csv_path)
+                        except OSError:
+                            pass
+            
+            # Only rewrite the cache if this run measured or dropped something
+            if prune_cache(cache) or cache_changed:
+                save_cache(folder, cache)
+            
+            if csvfile is not None and processed_count:
+                self.post_message('exported', csv_path)
             
-            # Complete (only if not stopped)
-            if not self.stop_requested:
-                self.output_queue.put(('progress', 100))
+            if stopped:
+                self.post_message('status', f"Analysis stopped by user after {processed_count}/{total_files} files")
+                self.post_message('stopped', processed_count)
+            else:
+                self.post_message('progress', 100)
                 search_info = f" {search_type}" if recursive else ""
-                self.output_queue.put(('status', f"Analysis complete! {total_files} files processed{search_info}"))
-                self.output_queue.put(('complete', None))
+                self.post_message('status', f"Analysis complete! {total_files} files processed{search_info}")
+                self.post_message('complete', None)
             
         except Exception as e:
-            self.output_queue.put(('error', str(e)))
+            self.post_message('error', str(e))
+    
+    def post_message(self, msg_type, data):
+        """Queue a message for the GUI and wake it up if it was idle"""
+        was_empty = not self.output_queue
+        self.output_queue.append((msg_type, data))
+        if was_empty:
+            try:
+                self.root.event_generate('<<QueueUpdate>>', when='tail')
+            except (tk.TclError, RuntimeError):
+                # Window closing or Tcl without thread support; the
+                # heartbeat picks the message up instead
+                pass
     
     def check_queue(self):
-        """Check for updates from background thread"""
-        try:
-            while True:
-                msg_type, data = self.output_queue.get_nowait()
-                
-                if msg_type == 'progress':
-                    self.progress_var.set(data)
-                elif msg_type == 'status':
-                    self.progress_label.config(text=data)
-                    self.status_var.set(data)
-                elif msg_type == 'result':
-                    self.add_result_to_tree(data)
-                elif msg_type == 'complete':
-                    self.analysis_complete()
-                elif msg_type == 'stopped':
-                    self.analysis_stopped(data)
-                elif msg_type == 'error':
-                    self.analysis_error(data)
-                    
-        except queue.Empty:
-            pass
-        
+        """Heartbeat that catches messages whose wakeup event was missed"""
+        self.drain_queue()
         if self.processing:
-            self.root.after(100, self.check_queue)
-    
-    def add_result_to_tree(self, result):
-        """Add analysis result to the treeview"""
-        values = (
-            result['folder'],
-            result['file'],
-            result['width_x'],
-            result['depth_y'], 
-            result['height_z'],
-            result['volume'],
-            result['triangle_count'],
-            result['status']
-        )
+            self.root.after(QUEUE_HEARTBEAT_MS, self.check_queue)
+    
+    def drain_queue(self):
+        """Handle pending updates from background thread"""
+        pending_results = []
+        latest_progress = None
+        # Only this thread pops, so a non-empty deque always has a message
+        for _ in range(QUEUE_DRAIN_LIMIT):
+            if not self.output_queue:
+                break
+            msg_type, data = self.output_queue.popleft()
+            
+            # Flush buffered rows before the analysis is wrapped up
+            if msg_type in ('complete', 'stopped', 'error') and pending_results:
+                self.add_results_to_tree(pending_results)
+                pending_results = []
+            
+            if msg_type == 'progress':
+                # Only the most recent value needs to be drawn
+                latest_progress = data
+            elif msg_type == 'status':
+                self.progress_label.config(text=data)
+                self.status_var.set(data)
+            elif msg_type == 'result':
+                if data.status == 'OK':
+                    self.success_count += 1
+                pending_results.append(data)
+                if len(pending_results) >= TREE_BATCH_SIZE:
+                    self.add_results_to_tree(pending_results)
+                    pending_results = []
+            elif msg_type == 'complete':
+                self.analysis_complete()
+            elif msg_type == 'stopped':
+                self.analysis_stopped(data)
+            elif msg_type == 'error':
+                self.analysis_error(data)
+            elif msg_type == 'exported':
+                self.last_export_path = data
+            elif msg_type == 'export_error':
+                messagebox.showerror("Export Error", f"Failed to export results:\n\n{data}")
         
-        # Color code based on status
-        tags = ('success',) if result['status'] == 'OK' else ('error',)
-        self.results_tree.insert('', tk.END, values=values, tags=tags)
+        if pending_results:
+            self.add_results_to_tree(pending_results)
+        if latest_progress is not None:
+            self.progress_var.set(latest_progress)
         
-        # Configure tags
-        self.results_tree.tag_configure('success', foreground='black')
-        self.results_tree.tag_configure('error', foreground='red')
+        # Come back right away if the limit left messages waiting
+        if self.output_queue:
+            self.root.after(1, self.drain_queue)
+    
+    def add_results_to_tree(self, results):
+        """Add a batch of analysis results to the treeview"""
+        for result in results:
+            values = TREE_FIELDS(result)
+            
+            # Color code based on status
+            tags = ('success',) if values[-1] == 'OK' else ('error',)
+            last_item = self.results_tree.insert('', tk.END, values=values, tags=tags)
         
-        # Auto-scroll to bottom
-        children = self.results_tree.get_children()
-        if children:
-            self.results_tree.see(children[-1])
+        # Auto-scroll to bottom once per batch
+        self.results_tree.see(last_item)
     
     def analysis_complete(self):
         """Handle analysis completion"""
@@ -431,9 +1070,10 @@ class STLAnalyzerGUI:
         self.open_folder_button.config(state='normal')
         self.browse_button.config(state='normal')
         self.recursive_checkbox.config(state='normal')
+        self.volume_checkbox.config(state='normal')
         
         # Show summary
-        successful = len([r for r in self.results if r['status'] == 'OK'])
+        successful = self.success_count
         total = len(self.results)
         failed = total - successful
         
@@ -444,8 +1084,8 @@ class STLAnalyzerGUI:
         self.progress_label.config(text=summary)
         self.status_var.set(summary)
         
-        # Auto-export results
-        self.auto_export_results()
+        # Results were exported while analyzing
+        self.show_export_status()
     
     def analysis_stopped(self, processed_count):
         """Handle analysis stop"""
@@ -455,9 +1095,10 @@ class STLAnalyzerGUI:
         self.stop_button.config(state='disabled', text="Stop Analysis")
         self.browse_button.config(state='normal')
         self.recursive_checkbox.config(state='normal')
+        self.volume_checkbox.config(state='normal')
         
         # Show summary
-        successful = len([r for r in self.results if r['status'] == 'OK'])
+        successful = self.success_count
         failed = len(self.results) - successful
         
         summary = f"⏹️ Analysis Stopped: {processed_count} files processed"
@@ -474,8 +1115,8 @@ class STLAnalyzerGUI:
         if self.results:
             self.export_button.config(state='normal')
             self.open_folder_button.config(state='normal')
-            # Auto-export partial results
-            self.auto_export_results()
+            # Partial results were exported while analyzing
+            self.show_export_status()
         
         # Show info dialog
         if successful > 0:
@@ -497,6 +1138,7 @@ class STLAnalyzerGUI:
         self.stop_button.config(state='disabled', text="Stop Analysis")
         self.browse_button.config(state='normal')
         self.recursive_checkbox.config(state='normal')
+        self.volume_checkbox.config(state='normal')
         
         error_text = f"❌ Analysis failed: {error_msg}"
         self.progress_label.config(text=error_text)
@@ -504,92 +1146,10 @@ class STLAnalyzerGUI:
         
         messagebox.showerror("Analysis Error", f"An error occurred during analysis:\n\n{error_msg}")
     
-    def get_stl_dimensions(self, stl_file_path, base_folder=None):
-        """Analyze a single STL file"""
-        if not STL_AVAILABLE:
-            return {
-                'folder': self.get_relative_folder(stl_file_path, base_folder),
-                'file': os.path.basename(stl_file_path),
-                'width_x': 0,
-                'depth_y': 0,
-                'height_z': 0,
-                'volume': 0,
-                'triangle_count': 0,
-                'unit': 'mm',
-                'status': 'Error: numpy-stl not installed'
-            }
-        
-        try:
-            stl_mesh = mesh.Mesh.from_file(stl_file_path)
-            points = stl_mesh.points.reshape(-1, 3)
-            min_coords = np.min(points, axis=0)
-            max_coords = np.max(points, axis=0)
-            dimensions = max_coords - min_coords
-            
-            try:
-                volume = stl_mesh.get_mass_properties()[0]
-            except:
-                volume = 0
-            
-            return {
-                'folder': self.get_relative_folder(stl_file_path, base_folder),
-                'file': os.path.basename(stl_file_path),
-                'width_x': round(dimensions[0], 3),
-                'depth_y': round(dimensions[1], 3),
-                'height_z': round(dimensions[2], 3),
-                'volume': round(volume, 3),
-                'triangle_count': len(stl_mesh.vectors),
-                'unit': 'mm',
-                'status': 'OK'
-            }
-            
-        except Exception as e:
-            return {
-                'folder': self.get_relative_folder(stl_file_path, base_folder),
-                'file': os.path.basename(stl_file_path),
-                'width_x': 0,
-                'depth_y': 0,
-                'height_z': 0,
-                'volume': 0,
-                'triangle_count': 0,
-                'unit': 'mm',
-                'status': f'Error: {str(e)}'
-            }
-    
-    def get_relative_folder(self, file_path, base_folder):
-        """Get relative folder path for display"""
-        if base_folder:
-            try:
-                parent_folder = os.path.dirname(file_path)
-                if parent_folder == base_folder:
-                    return "."  # Root folder
-                else:
-                    return os.path.relpath(parent_folder, base_folder)
-            except:
-                return os.path.dirname(file_path)
-        return os.path.dirname(file_path)
-    
-    def auto_export_results(self):
-        """Automatically export results to CSV"""
-        if not self.results:
-            return
-        
-        try:
-            folder = self.selected_folder.get()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            csv_path = os.path.join(folder, f"stl_dimensions_{timestamp}.csv")
-            
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = self.results[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.results)
-            
-            self.last_export_path = csv_path
-            self.status_var.set(f"Results exported to: {os.path.basename(csv_path)}")
-            
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export results:\n\n{e}")
+    def show_export_status(self):
+        """Show where the automatic CSV export was written"""
+        if self.last_export_path:
+            self.status_var.set(f"Results exported to: {os.path.basename(self.last_export_path)}")
     
     def export_results(self):
         """Manual export with file dialog"""
@@ -605,11 +1165,7 @@ class STLAnalyzerGUI:
         
         if file_path:
             try:
-                with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = self.results[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(self.results)
+                write_results_csv(file_path, self.results)
                 
                 messagebox.showinfo("Export Complete", f"Results exported successfully to:\n{file_path}")
                 self.status_var.set(f"Results exported to: {os.path.basename(file_path)}")
@@ -638,4 +1194,6 @@ def main():
         messagebox.showerror("Application Error", f"An unexpected error occurred:\n\n{e}")
 
 if __name__ == "__main__":
+    # Required for worker processes in the frozen Windows executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file